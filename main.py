@@ -2,39 +2,235 @@
 
 from sys import exit
 from argparse import ArgumentParser
-from os import getenv
-
+from asyncio import Semaphore, gather, run as run_async
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from glob import glob
+from hashlib import blake2b, sha256
+from itertools import repeat
+from json import dumps, loads
+import os
+from os import getenv, replace
+from os.path import getsize, realpath
+from pathlib import Path
+from subprocess import run
+from tempfile import NamedTemporaryFile
+
+import av
+import numpy as np
+from av.error import FFmpegError
+from ctranslate2 import get_cuda_device_count, get_supported_compute_types
 from dotenv import find_dotenv, load_dotenv
-from moviepy.editor import VideoFileClip
-from openai import OpenAI
-from whisper import load_model, DecodingOptions
+from faster_whisper import WhisperModel
+from openai import AsyncOpenAI
+from psutil import cpu_count
 
 # Load env vars for OpenAI API and organization
 load_dotenv(find_dotenv())
-openai_api_key = getenv("OPENAI_API_KEY")
-openai_api_org = getenv("OPENAI_API_ORG")
-if not openai_api_key or not openai_api_org:
-    exit("Environment variables not found: OPENAI_API_KEY and/or OPENAI_API_ORG")
-
-# Load OpenAI API client
-client = OpenAI(
-    organization=openai_api_org,
-    api_key=openai_api_key,
+
+
+def get_cpu_threads() -> int:
+    """
+    Get the number of threads to use for whisper inference on the CPU: the
+    value of `OMP_NUM_THREADS` if set, otherwise the number of physical cores
+    available to this process. This respects CPU affinity (e.g., containers
+    pinned to a subset of CPUs) and only discounts hyperthreads when SMT is
+    actually enabled.
+
+    Returns
+    -------
+        int
+            Number of CPU threads.
+    """
+    omp_num_threads = getenv("OMP_NUM_THREADS", "")
+    if omp_num_threads.isdigit() and int(omp_num_threads) > 0:
+        return int(omp_num_threads)
+
+    logical = cpu_count() or 1
+    physical = cpu_count(logical=False) or logical
+    available = (
+        len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else logical
+    )
+    return max(1, available * physical // logical)
+
+
+# Threads for whisper inference on the CPU, avoiding oversubscription
+CPU_THREADS = get_cpu_threads()
+
+# Local cache for transcriptions and summaries
+CACHE_DIR = Path.home() / ".cache" / "yt-timestamps"
+
+# System prompt for timestamp generation, without source indentation so it
+# doesn't inflate the prompt's token count
+SYSTEM_PROMPT = (
+    "You are a helpful assistant that will summarize audio transcripts and "
+    "generate YouTube video timestamps for important topics in the transcript. "
+    "You will adhere to YouTube video timestamp format. The format expects the "
+    "timestamps to be formatted as `HH:MM:SS` for videos longer than an hour and "
+    "as `MM:SS` for videos less than an hour. For example, a video with a length "
+    "of 00:59:59 (provided as `HH:MM:SS`) would have timestamps formatted as "
+    "`MM:SS`, with a min value of 00:00 and a max value of 59:59.\n\n"
+    "The timestamps should consider segments in the transcript but not include "
+    "each segment but only summarize the general themes. The timestamps should "
+    "not exceed the full length of the video. Segments will be provided as a "
+    "JSON array of objects, each with the segment's start time `t` (formatted "
+    "like a YouTube timestamp) and its text `txt`, to assist with YouTube "
+    "timestamp chapter generation. You should not generate a summary for each "
+    "segment, but rather, generate a set of summary YouTube timestamps that can "
+    "be used as key points across all segments.\n\n"
+    "For example, a video with a length of 00:20:00 might have 8-10 total "
+    "timestamps with the timestamp format `MM:SS`. It might have a set of input "
+    "text that follows the format:\n"
+    "```\n"
+    '[{"t":"0:00","txt":"This is the first sentence of the first segment."},'
+    '{"t":"1:00","txt":"This is the second sentence of the second segment."},'
+    '{"t":"1:15","txt":"This is the third sentence of the third segment."}]\n'
+    "```\n"
+    "Which would result in a set of timestamps like:\n"
+    "```\n"
+    "0:00 - Introduction\n"
+    "1:15 - Topic overview\n"
+    "etc.\n"
+    "```"
+)
+
+# System prompt for merging the candidate timestamps of each transcript window
+REDUCE_PROMPT = (
+    "You are a helpful assistant that will merge candidate YouTube video "
+    "timestamps, generated separately for consecutive windows of one audio "
+    "transcript, into a single set of YouTube video timestamps. Combine "
+    "candidates that cover the same topic, drop minor ones, and keep the "
+    "timestamps in order, such that a video with a length of 00:20:00 has "
+    "8-10 total timestamps. You will adhere to YouTube video timestamp format: "
+    "`HH:MM:SS` for videos longer than an hour and `MM:SS` for videos less than "
+    "an hour, with the first timestamp at 0:00. Only output the timestamps, one "
+    "per line, formatted like `1:15 - Topic overview`."
 )
 
-# Load whisper model
-options = DecodingOptions(fp16=False, language="en")
-whisper_model = load_model("base.en")
+# Transcripts are summarized in windows of this many seconds, concurrently
+SUMMARY_WINDOW = 600
+MAX_CONCURRENT_REQUESTS = 8
+request_limit = Semaphore(MAX_CONCURRENT_REQUESTS)
 
 
-def cmd() -> str:
+@lru_cache(maxsize=None)
+def get_client() -> AsyncOpenAI:
     """
-    Parse command line arguments for video file path.
+    Load the (async) OpenAI API client once per process.
+
+    Returns
+    -------
+        AsyncOpenAI
+            OpenAI API client.
+    """
+    openai_api_key = getenv("OPENAI_API_KEY")
+    openai_api_org = getenv("OPENAI_API_ORG")
+    if not openai_api_key or not openai_api_org:
+        exit("Environment variables not found: OPENAI_API_KEY and/or OPENAI_API_ORG")
+
+    return AsyncOpenAI(
+        organization=openai_api_org,
+        api_key=openai_api_key,
+    )
+
+
+def get_device() -> str:
+    """
+    Pick the device to run the whisper model on, using a CUDA GPU when one is
+    available and falling back to the CPU.
 
     Returns
     -------
         str
-            Path to video file.
+            CTranslate2 device name, `cuda` or `cpu`.
+    """
+    return "cuda" if get_cuda_device_count() > 0 else "cpu"
+
+
+def get_compute_type(device: str) -> str:
+    """
+    Pick the fastest compute type the device supports, preferring int8
+    quantized weights (with float16 activations where available) over FP32.
+
+    Parameters
+    ----------
+        device : str
+            CTranslate2 device name, e.g., `cpu` or `cuda`.
+
+    Returns
+    -------
+        str
+            CTranslate2 compute type.
+    """
+    supported = get_supported_compute_types(device)
+    for compute_type in ("int8_float16", "int8", "float16"):
+        if compute_type in supported:
+            return compute_type
+    return "float32"
+
+
+def get_model(
+    cpu_threads: int = CPU_THREADS, num_workers: int = 1, device: str | None = None
+) -> WhisperModel:
+    """
+    Load the whisper model once per process, on first use, on the GPU if
+    available. If the GPU is detected but the model can't run on it, e.g.,
+    because the CUDA libraries are missing, the CPU is used instead. CTranslate2
+    only loads those libraries on first use, so the model is checked by
+    transcribing a second of silence.
+
+    Parameters
+    ----------
+        cpu_threads : int
+            Number of threads used for inference on the CPU.
+        num_workers : int
+            Number of concurrent transcriptions the model can run.
+        device : str | None
+            CTranslate2 device to load the model on, instead of detecting it.
+
+    Returns
+    -------
+        WhisperModel
+            Whisper model (CTranslate2 backend with int8 quantized weights).
+    """
+    # Pass arguments positionally so equivalent calls share one cache entry
+    return load_model(cpu_threads, num_workers, device)
+
+
+@lru_cache(maxsize=None)
+def load_model(cpu_threads: int, num_workers: int, device: str | None) -> WhisperModel:
+    """Load the whisper model for `get_model`, cached per set of arguments"""
+    for device in (device,) if device else dict.fromkeys((get_device(), "cpu")):
+        try:
+            model = WhisperModel(
+                "base.en",
+                device=device,
+                compute_type=get_compute_type(device),
+                cpu_threads=cpu_threads,
+                num_workers=num_workers,
+            )
+            if device != "cpu":
+                segments, _ = model.transcribe(
+                    np.zeros(16000, np.float32), language="en", beam_size=1
+                )
+                list(segments)
+            return model
+        except RuntimeError as e:
+            if device == "cpu":
+                raise
+            print(f"Cannot run whisper model on {device}, falling back to CPU: {e}")
+
+
+def cmd() -> tuple[list[str], bool]:
+    """
+    Parse command line arguments for video file paths. Glob patterns are
+    expanded, so a quoted pattern like `"videos/*.mp4"` also works, and paths
+    that refer to the same file are only included once.
+
+    Returns
+    -------
+        tuple[list[str], bool]
+            Paths to video files, and whether to read from the local cache.
     """
 
     parser = ArgumentParser(
@@ -43,11 +239,89 @@ def cmd() -> str:
     parser.add_argument(
         "--file",
         type=str,
-        default=None,
-        help="Input video file path to transcribe.",
+        nargs="+",
+        required=True,
+        help="Input video file path(s) or glob pattern(s) to transcribe.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached transcriptions and summaries (results are re-cached).",
     )
     args = parser.parse_args()
-    return args.file
+    paths = {}
+    for pattern in args.file:
+        for path in sorted(glob(pattern)) or [pattern]:
+            paths.setdefault(realpath(path), path)
+    return list(paths.values()), not args.no_cache
+
+
+@lru_cache(maxsize=None)
+def probe(video_path: str) -> tuple[float, bool]:
+    """
+    Probe a video file's duration and whether it has an audio stream, with a
+    single in-process container open. Results are cached so the duration and
+    audio stream checks share one probe.
+
+    Parameters
+    ----------
+        video_path : str
+            Path to video file.
+
+    Returns
+    -------
+        tuple[float, bool]
+            Duration of video file in seconds, and whether it has audio.
+    """
+    try:
+        with av.open(video_path) as container:
+            if container.duration is None:
+                raise ValueError("Cannot determine file duration.")
+            return container.duration / av.time_base, bool(container.streams.audio)
+    except FFmpegError as e:
+        raise ValueError(f"Cannot probe file: {e}") from e
+
+
+def extract_audio(video_path: str) -> np.ndarray:
+    """
+    Extract a video file's audio as 16kHz mono PCM with ffmpeg, which is the
+    input format the whisper model expects. Downmixing and resampling happen in
+    ffmpeg, so only the final samples are passed back to Python.
+
+    Parameters
+    ----------
+        video_path : str
+            Path to video file.
+
+    Returns
+    -------
+        np.ndarray
+            Audio samples as float32 in the range [-1.0, 1.0].
+    """
+    proc = run(
+        [
+            "ffmpeg",
+            "-nostdin",
+            "-v",
+            "error",
+            "-i",
+            video_path,
+            # Only decode the first audio stream, skipping video and others
+            "-map",
+            "0:a:0",
+            "-f",
+            "s16le",
+            "-ac",
+            "1",
+            "-ar",
+            "16000",
+            "-",
+        ],
+        capture_output=True,
+    )
+    if proc.returncode != 0:
+        raise ValueError(f"Cannot extract audio: {proc.stderr.decode().strip()}")
+    return np.frombuffer(proc.stdout, np.int16).astype(np.float32) / 32768.0
 
 
 def get_video_duration(video_path: str) -> str:
@@ -64,17 +338,13 @@ def get_video_duration(video_path: str) -> str:
         str
             Duration of video file in HH:MM:SS format.
     """
-    with VideoFileClip(video_path) as video:
-        duration = video.duration
-        hours = int(duration // 3600)
-        minutes = int((duration % 3600) // 60)
-        seconds = int(duration % 60)
-        return f"{hours}:{minutes}:{seconds}"
+    return _fmt_hms(probe(video_path)[0])
 
 
-def transcribe(video_path) -> str:
+def cache_key(video_path: str) -> str:
     """
-    Transcribe a video file with the whisper model.
+    Compute a cache key for a video file from its first 1MB and total size,
+    which avoids hashing the entire (potentially large) file.
 
     Parameters
     ----------
@@ -84,14 +354,142 @@ def transcribe(video_path) -> str:
     Returns
     -------
         str
-            Transcription of video file.
+            Hex digest identifying the video file's contents.
+    """
+    with open(video_path, "rb") as f:
+        head = f.read(1 << 20)
+    return blake2b(head + str(getsize(video_path)).encode()).hexdigest()
+
+
+def read_cache(cache_file: Path) -> str | None:
+    """
+    Read a cache file, treating a missing or unreadable file as a cache miss.
+
+    Parameters
+    ----------
+        cache_file : Path
+            Path to cache file.
+
+    Returns
+    -------
+        str | None
+            Cached content, or `None` on a cache miss.
     """
     try:
-        with VideoFileClip(video_path) as video:
-            if video.audio is None:
-                raise ValueError("File does not contain an audio stream.")
+        return cache_file.read_text(encoding="utf-8")
+    except OSError:
+        return None
+
 
-        result = whisper_model.transcribe(video_path, **options.__dict__, verbose=False)
+def write_cache(cache_file: Path, content: str) -> None:
+    """
+    Write a cache file atomically, so an interrupted run never leaves a
+    partial file behind. Failures are logged rather than raised, since the
+    cache is only an optimization.
+
+    Parameters
+    ----------
+        cache_file : Path
+            Path to cache file.
+        content : str
+            Content to cache.
+    """
+    tmp_path = None
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with NamedTemporaryFile(
+            "w", encoding="utf-8", dir=cache_file.parent, suffix=".tmp", delete=False
+        ) as f:
+            tmp_path = f.name
+            f.write(content)
+        replace(tmp_path, cache_file)
+    except OSError as e:
+        print(f"Could not write cache file {cache_file}: {e}")
+        if tmp_path:
+            Path(tmp_path).unlink(missing_ok=True)
+
+
+def is_transcription(result) -> bool:
+    """
+    Check that a (cached) result has the shape `transcribe` returns.
+
+    Parameters
+    ----------
+        result : Any
+            Decoded JSON value.
+
+    Returns
+    -------
+        bool
+            Whether the result is a dict with a list of `segments` that each
+            have a `start`, `end`, and `text` key.
+    """
+    return (
+        isinstance(result, dict)
+        and isinstance(result.get("segments"), list)
+        and all(
+            isinstance(s, dict) and {"start", "end", "text"} <= s.keys()
+            for s in result["segments"]
+        )
+    )
+
+
+def transcribe(
+    video_path: str,
+    cpu_threads: int = CPU_THREADS,
+    use_cache: bool = True,
+    device: str | None = None,
+) -> dict | None:
+    """
+    Transcribe a video file with the whisper model. Results are cached on disk
+    so re-running on the same video skips transcription entirely.
+
+    Parameters
+    ----------
+        video_path : str
+            Path to video file.
+        cpu_threads : int
+            Number of threads used for inference on the CPU.
+        use_cache : bool
+            Whether to return a cached transcription, if there is one.
+        device : str | None
+            CTranslate2 device to run the model on, instead of detecting it.
+
+    Returns
+    -------
+        dict | None
+            Transcription of video file, with a list of `segments` that each
+            have a `start`, `end`, and `text` key, or `None` if it failed.
+    """
+    try:
+        cache_file = CACHE_DIR / f"{cache_key(video_path)}.json"
+        cached = read_cache(cache_file) if use_cache else None
+        if cached is not None:
+            try:
+                result = loads(cached)
+            except ValueError:
+                result = None
+            if is_transcription(result):
+                print(f"Using cached transcription: {cache_file}")
+                return result
+            print(f"Ignoring invalid cached transcription: {cache_file}")
+
+        _, has_audio = probe(video_path)
+        if not has_audio:
+            raise ValueError("File does not contain an audio stream.")
+
+        audio = extract_audio(video_path)
+        segments, _ = get_model(cpu_threads, device=device).transcribe(
+            audio, language="en", vad_filter=True, beam_size=1
+        )
+        # Segments are lazily decoded, so materialize them here
+        result = {
+            "segments": [
+                {"start": s.start, "end": s.end, "text": s.text} for s in segments
+            ]
+        }
+
+        write_cache(cache_file, dumps(result))
         return result
     except ValueError as e:
         print(f"Error transcribing video: {e}")
@@ -101,9 +499,31 @@ def transcribe(video_path) -> str:
         return None
 
 
-def segments_to_srt(segments) -> str:
+def write_srt(segments, fh) -> None:
     """
-    Convert segments to SRT format.
+    Write segments to a file handle in SRT format, one segment at a time.
+
+    Parameters
+    ----------
+        segments : list
+            List of segments from whisper model.
+        fh : TextIO
+            Writable text file handle.
+    """
+    # SRT index starts from 1, with an empty line after each segment
+    fh.writelines(
+        f"{i}\n"
+        f"{format_time(segment['start'])} --> {format_time(segment['end'])}\n"
+        f"{segment['text'].strip()}\n\n"
+        for i, segment in enumerate(segments, 1)
+    )
+
+
+def segments_to_compact(segments) -> str:
+    """
+    Convert segments to a compact JSON array for the summary prompt, with each
+    segment's start time as a YouTube timestamp and its text. This uses far
+    fewer tokens than SRT format.
 
     Parameters
     ----------
@@ -113,150 +533,316 @@ def segments_to_srt(segments) -> str:
     Returns
     -------
         str
-            SRT formatted segments.
+            JSON array of `{"t": timestamp, "txt": text}` objects.
     """
-    srt_text = []
-    for i, segment in enumerate(segments):
-        # SRT index starts from 1
-        srt_index = i + 1
-        srt_text.append(str(srt_index))
-
-        # Formatting start and end times
-        start_time = format_time(segment["start"])
-        end_time = format_time(segment["end"])
-        srt_text.append(f"{start_time} --> {end_time}")
-
-        # Adding text
-        srt_text.append(segment["text"].strip())
+    return dumps(
+        [
+            {"t": format_timestamp(segment["start"]), "txt": segment["text"].strip()}
+            for segment in segments
+        ],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
 
-        # Add an empty line after each segment
-        srt_text.append("")
 
-    return "\n".join(srt_text)
+def _fmt_hms(seconds, pad: bool = True, ms: bool = False) -> str:
+    """
+    Convert time in seconds to `HH:MM:SS` format, with `,mmm` if `ms` is set.
+    Without `pad`, hours are omitted when zero and the leading field isn't
+    zero-padded, as in YouTube timestamps (`M:SS` or `H:MM:SS`).
+    """
+    milliseconds = int(seconds * 1000)
+    minutes, secs = divmod(milliseconds // 1000, 60)
+    hours, minutes = divmod(minutes, 60)
+    if pad:
+        hms = "%02d:%02d:%02d" % (hours, minutes, secs)
+    elif hours:
+        hms = "%d:%02d:%02d" % (hours, minutes, secs)
+    else:
+        hms = "%d:%02d" % (minutes, secs)
+    return "%s,%03d" % (hms, milliseconds % 1000) if ms else hms
 
 
 def format_time(seconds) -> str:
     """Convert time in seconds to SRT time format"""
-    hours, remainder = divmod(seconds, 3600)
-    minutes, seconds = divmod(remainder, 60)
-    milliseconds = int((seconds - int(seconds)) * 1000)
-    return f"{int(hours):02d}:{int(minutes):02d}:{int(seconds):02d},{milliseconds:03d}"
+    return _fmt_hms(seconds, ms=True)
+
+
+def format_timestamp(seconds) -> str:
+    """Convert time in seconds to YouTube timestamp format"""
+    return _fmt_hms(seconds, pad=False)
 
 
-def generate_summary(transcript: str, length: int) -> str:
+async def chat_completion(
+    system_prompt: str, user_prompt: str, model: str = "gpt-4o", use_cache: bool = True
+) -> str:
+    """
+    Get a chat completion from OpenAI's API. Responses are cached on disk by a
+    hash of the model and prompts, so identical requests skip the API call.
+
+    Parameters
+    ----------
+        system_prompt : str
+            System message content.
+        user_prompt : str
+            User message content.
+        model : str
+            OpenAI model name.
+        use_cache : bool
+            Whether to return a cached response, if there is one.
+
+    Returns
+    -------
+        str
+            Response message content.
+    """
+    key = sha256("\0".join((model, system_prompt, user_prompt)).encode()).hexdigest()
+    cache_file = CACHE_DIR / f"summ_{key}.txt"
+    cached = read_cache(cache_file) if use_cache else None
+    if cached is not None:
+        print(f"Using cached summary: {cache_file}")
+        return cached
+
+    async with request_limit:
+        response = await get_client().chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            temperature=0.7,
+        )
+    content = response.choices[0].message.content.strip()
+
+    write_cache(cache_file, content)
+    return content
+
+
+async def generate_summary(
+    segments: list, duration: float, use_cache: bool = True
+) -> str:
     """
     Generate a summary of the transcript using OpenAI's gpt-4 model as YouTube
     timestamps.
 
     The summary should be a set of YouTube timestamps that can be used as key
-    points across all segments.
+    points across all segments. Long transcripts are split into windows of
+    `SUMMARY_WINDOW` seconds that are summarized concurrently, and the candidate
+    timestamps of each window are then merged with a final request.
 
     Parameters
     ----------
-        transcript : str
-            Transcript of the video.
-        length : int
+        segments : list
+            List of segments from whisper model.
+        duration : float
+            Duration of the video in seconds.
+        use_cache : bool
+            Whether to return cached responses, if there are any.
 
     Returns
     -------
         str
             Summary of the transcript as YouTube timestamps.
     """
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {
-                "role": "system",
-                "content": """You are a helpful assistant that will summarize
-                           audio transcripts and generate YouTube video
-                           timestamps for important topics in the transcript.
-                           You will adhere to YouTube video timestamp format.
-                           The format expects the timestamps to be formatted as
-                           `HH:MM:SS` for videos longer than an hour and as `MM:SS`
-                           for videos less than an hour. For example, a video
-                           with a length of 00:59:59 (provided as `HH:MM:SS`)
-                           would have timestamps formatted as `MM:SS`, with a min
-                           value of 00:00 and a max value of 59:59. 
-                           
-                           The timestamps should consider segments in the
-                           transcript but not include each segment but only
-                           summarize the general themes. The timestamps should
-                           not exceed the full length of the video. Segments
-                           will be provided in SRT format `HH:MM:SS,MS -->
-                           HH:MM:SS,MS` to assist with YouTube timestamp chapter
-                           generation. You should not generate a summary for
-                           each SRT segment, but rather, generate a set of
-                           summary YouTube timestamps that can be used as key
-                           points across all segments. 
-                           
-                           For example, a video with
-                           a length of 00:20:00 might have 8-10 total timestamps
-                           with the timestamp format `MM:SS`. It might have a
-                           set of input text that follows the format: 
-                           ```
-                           1
-                           00:00:00,000 --> 00:01:00,000
-                           This is the first sentence of the first segment.
-                           
-                           2
-                           00:01:00,000 --> 00:01:15,000
-                           This is the second sentence of the second segment.
-                           
-                           3
-                           00:01:15,000 --> 00:02:20,000
-                           This is the third sentence of the third segment.
-                           ```
-                           Which would result in a set of timestamps like:
-                           ```
-                           0:00 - Introduction
-                           1:15 - Topic overview
-                           etc.
-                           ```
-                """,
-            },
-            {
-                "role": "user",
-                "content": f"The following transcript is for a video of length {length}:\n {transcript}",
-            },
-        ],
-        temperature=0.7,
+    length = _fmt_hms(duration)
+    windows = {}
+    for segment in segments:
+        windows.setdefault(int(segment["start"] // SUMMARY_WINDOW), []).append(segment)
+
+    if len(windows) <= 1:
+        user_prompt = (
+            f"The following transcript is for a video of length {length}:\n "
+            f"{segments_to_compact(segments)}"
+        )
+        return await chat_completion(SYSTEM_PROMPT, user_prompt, use_cache=use_cache)
+
+    candidates = await gather(
+        *(
+            chat_completion(
+                SYSTEM_PROMPT,
+                f"The following transcript is the part from "
+                f"{format_timestamp(window * SUMMARY_WINDOW)} to "
+                f"{format_timestamp(min((window + 1) * SUMMARY_WINDOW, duration))} "
+                f"of a video of length {length}. Only generate timestamps within "
+                f"that part:\n "
+                f"{segments_to_compact(window_segments)}",
+                use_cache=use_cache,
+            )
+            for window, window_segments in windows.items()
+        )
+    )
+    user_prompt = (
+        f"The following candidate timestamps are for a video of length {length}:\n"
+        + "\n".join(candidates)
+    )
+    return await chat_completion(REDUCE_PROMPT, user_prompt, use_cache=use_cache)
+
+
+def output_paths(video_paths: list[str]) -> list[tuple[str, str]]:
+    """
+    Get the SRT and timestamps output file paths for video files. When
+    processing a batch of files, outputs are prefixed with each video's name so
+    they don't overwrite each other, with a `-2`, `-3`, etc. suffix for videos
+    that share a name.
+
+    Parameters
+    ----------
+        video_paths : list[str]
+            Paths to video files.
+
+    Returns
+    -------
+        list[tuple[str, str]]
+            Paths to the SRT segments file and the YouTube timestamps file of
+            each video file.
+    """
+    if len(video_paths) == 1:
+        return [("segments.srt", "timestamps.txt")]
+
+    names, outputs = set(), []
+    for video_path in video_paths:
+        stem = name = Path(video_path).stem
+        n = 1
+        while name in names:
+            n += 1
+            name = f"{stem}-{n}"
+        names.add(name)
+        outputs.append((f"{name}.segments.srt", f"{name}.timestamps.txt"))
+    return outputs
+
+
+def transcribe_all(video_paths: list[str], use_cache: bool = True) -> list[dict]:
+    """
+    Transcribe video files, in parallel worker processes when there are
+    multiple files and the model runs on the CPU. Each worker loads its own
+    whisper model once, and the CPU threads are split between workers. On
+    a GPU, files are transcribed in this process so only one copy of the model
+    is loaded onto the device.
+
+    Parameters
+    ----------
+        video_paths : list[str]
+            Paths to video files.
+        use_cache : bool
+            Whether to return cached transcriptions, if there are any.
+
+    Returns
+    -------
+        list[dict]
+            Transcription of each video file, or `None` if it failed.
+    """
+    # Check the device the model actually runs on, in case it fell back to CPU
+    if get_device() == "cuda" and get_model().model.device == "cuda":
+        max_workers = 1
+    else:
+        max_workers = min(len(video_paths), CPU_THREADS)
+    if max_workers == 1:
+        return [transcribe(path, use_cache=use_cache) for path in video_paths]
+
+    cpu_threads = max(1, CPU_THREADS // max_workers)
+    # Workers run on the CPU, without each one probing the GPU again
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(
+            executor.map(
+                transcribe,
+                video_paths,
+                repeat(cpu_threads),
+                repeat(use_cache),
+                repeat("cpu"),
+            )
+        )
+
+
+async def generate_summaries(
+    transcripts: list[list], durations: list[float], use_cache: bool = True
+) -> list[str | Exception]:
+    """
+    Generate summaries for multiple transcripts concurrently. A failed summary
+    doesn't cancel the others, and is returned as its exception instead.
+
+    Parameters
+    ----------
+        transcripts : list[list]
+            Transcript segments of each video.
+        durations : list[float]
+            Duration of each video in seconds.
+        use_cache : bool
+            Whether to return cached responses, if there are any.
+
+    Returns
+    -------
+        list[str | Exception]
+            Summary of each transcript as YouTube timestamps, or the exception
+            raised while generating it.
+    """
+    return await gather(
+        *(
+            generate_summary(t, duration, use_cache)
+            for t, duration in zip(transcripts, durations)
+        ),
+        return_exceptions=True,
     )
-    return response.choices[0].message.content.strip()
 
 
 def main():
     """
-    Transcribe a video file and generate YouTube timestamps.
-    - Get the video file path from the command line.
-    - Get the duration of the video file.
-    - Transcribe the video file.
+    Transcribe video files and generate YouTube timestamps.
+    - Get the video file paths from the command line.
+    - Get the duration of each video file.
+    - Transcribe the video files.
     - Convert the segments to SRT format.
-    - Generate a summary of the transcript as YouTube timestamps.
+    - Generate summaries of the transcripts as YouTube timestamps.
     """
     try:
-        # Get video file path
-        video_path = cmd()
-        duration = get_video_duration(video_path)
-        print(f"Video duration: {duration}")
-
-        # Transcribe video and convert to SRT
-        transcript = transcribe(video_path)
-        if transcript is None:
+        # Get video file paths and fail fast on missing OpenAI credentials
+        video_paths, use_cache = cmd()
+        get_client()
+        outputs = dict(zip(video_paths, output_paths(video_paths)))
+        durations, failed = {}, []
+        for video_path in video_paths:
+            try:
+                durations[video_path], _ = probe(video_path)
+            except (ValueError, OSError) as e:
+                print(f"Error probing video {video_path}: {e}")
+                failed.append(video_path)
+                continue
+            print(f"Video duration: {get_video_duration(video_path)} ({video_path})")
+
+        # Transcribe videos and write them as SRT
+        probed = list(durations)
+        results = transcribe_all(probed, use_cache) if probed else []
+        failed += [p for p, t in zip(probed, results) if t is None]
+        if len(failed) == len(video_paths):
             raise Exception("Cannot proceed without a valid transcription.")
 
-        segments = segments_to_srt(transcript["segments"])
-        # Write segments to file
-        segments_file = "segments.srt"
-        with open(segments_file, "w") as f:
-            print(f"Writing segments SRT file to: {segments_file}")
-            f.write(segments)
-        summary = generate_summary(segments, duration)
-
-        # Write summary to file
-        timestamps_file = "timestamps.txt"
-        with open(timestamps_file, "w") as f:
-            print(f"Writing YouTube timestamps file to: {timestamps_file}")
-            f.write(summary)
+        done, transcripts, lengths = [], [], []
+        for video_path, transcript in zip(probed, results):
+            if transcript is None:
+                continue
+            # Stream segments to file, buffering writes in large blocks
+            segments_file, _ = outputs[video_path]
+            with open(segments_file, "w", buffering=1 << 20, encoding="utf-8") as f:
+                print(f"Writing segments SRT file to: {segments_file}")
+                write_srt(transcript["segments"], f)
+            done.append(video_path)
+            transcripts.append(transcript["segments"])
+            lengths.append(durations[video_path])
+
+        summaries = run_async(generate_summaries(transcripts, lengths, use_cache))
+
+        # Write summaries to file
+        for video_path, summary in zip(done, summaries):
+            if isinstance(summary, Exception):
+                print(f"Error generating timestamps for {video_path}: {summary}")
+                failed.append(video_path)
+                continue
+            _, timestamps_file = outputs[video_path]
+            with open(timestamps_file, "w", encoding="utf-8") as f:
+                print(f"Writing YouTube timestamps file to: {timestamps_file}")
+                f.write(summary)
+
+        if failed:
+            raise Exception(f"Failed to process: {', '.join(failed)}")
     except Exception as e:
         exit(f"Error processing video: {e}")
 